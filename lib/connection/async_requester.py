@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+import asyncio
+import httpx
+import random
+import socket
+import ssl
+
+from urllib.parse import urlparse, urlsplit
+
+from lib.core.data import options
+from lib.core.exceptions import RequestException
+from lib.core.logger import logger
+from lib.connection.requester import BaseRequester
+from lib.connection.response import AsyncResponse
+from lib.utils.common import safequote
+
+
+class HTTPXRawPathURL(httpx.URL):
+    """
+    httpx normalizes the URL path (e.g. /a/../b becomes /b), this keeps the path
+    as it is, which is what gets sent in the request line
+    """
+
+    def __init__(self, url):
+        super().__init__(url)
+        # urlsplit() rather than urlparse(), which would cut ";params" off the path
+        parsed = urlsplit(url)
+        self._raw_url = url
+        self._raw_path = (parsed.path or "/").encode()
+
+        if parsed.query:
+            self._raw_path += b"?" + parsed.query.encode()
+
+    @property
+    def raw_path(self):
+        return self._raw_path
+
+    def __str__(self):
+        return self._raw_url
+
+
+class AsyncRequester(BaseRequester):
+    def __init__(self):
+        # httpx clients are bound to a proxy, so there is one client per proxy
+        self.sessions = {}
+        super().__init__()
+        self._auth = None
+
+    def __getstate__(self):
+        # httpx clients are bound to an event loop and can't be pickled,
+        # new ones will be created on the first request after resuming
+        state = self.__dict__.copy()
+        state["sessions"] = {}
+        return state
+
+    def _create_session(self, proxy):
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+
+        if options["cert_file"]:
+            ssl_context.load_cert_chain(options["cert_file"], options["key_file"])
+
+        # With HTTP/2, concurrent requests are multiplexed over a single connection
+        # per host instead of doing a TCP/TLS handshake for each of them
+        return httpx.AsyncClient(
+            http2=True,
+            # Headers are the same for every request, so they are built into
+            # the client once instead of being passed to each request
+            headers=self.headers,
+            verify=ssl_context,
+            proxy=self.parse_proxy(proxy) if proxy else None,
+            limits=httpx.Limits(
+                max_connections=options["thread_count"],
+                max_keepalive_connections=options["thread_count"],
+            ),
+            timeout=httpx.Timeout(options["timeout"]),
+        )
+
+    def get_session(self, proxy):
+        if proxy not in self.sessions:
+            self.sessions[proxy] = self._create_session(proxy)
+
+        return self.sessions[proxy]
+
+    def set_header(self, key, value):
+        super().set_header(key, value)
+
+        for session in self.sessions.values():
+            session.headers[key] = value.lstrip()
+
+    def set_auth(self, type, credential):
+        if type in ("bearer", "jwt"):
+            self.set_header("authorization", f"Bearer {credential}")
+        else:
+            try:
+                user, password = credential.split(":", 1)
+            except ValueError:
+                user = credential
+                password = ""
+
+            # Other authentication types aren't supported in asynchronous mode,
+            # they are rejected while parsing options
+            self._auth = (user, password)
+
+    # :path: is expected not to start with "/"
+    async def request(self, path, proxy=None):
+        # Pause if the request rate exceeded the maximum
+        while self.is_rate_exceeded():
+            await asyncio.sleep(0.1)
+
+        self.increase_rate()
+
+        err_msg = None
+
+        # Safe quote all special characters to prevent them from being encoded
+        url = safequote(self._url + path if self._url else path)
+
+        for _ in range(options["max_retries"] + 1):
+            try:
+                try:
+                    proxy = proxy or random.choice(options["proxies"])
+                except IndexError:
+                    pass
+
+                session = self.get_session(proxy)
+                request = session.build_request(
+                    options["http_method"],
+                    url,
+                    # Only the user agent can change between requests
+                    headers={"user-agent": random.choice(self.agents)} if self.agents else None,
+                    content=options["data"],
+                )
+                # Replace the URL to avoid the URL path from being normalized
+                request.url = HTTPXRawPathURL(url)
+
+                xresponse = await session.send(
+                    request,
+                    auth=self._auth,
+                    follow_redirects=options["follow_redirects"],
+                    stream=True,
+                )
+
+                try:
+                    response = await AsyncResponse.create(xresponse)
+                finally:
+                    await xresponse.aclose()
+
+                log_msg = f'"{options["http_method"]} {response.url}" {response.status} - {response.length}B'
+
+                if response.redirect:
+                    log_msg += f" - LOCATION: {response.redirect}"
+
+                logger.info(log_msg)
+
+                return response
+
+            except Exception as e:
+                logger.exception(e)
+
+                # httpx wraps the original exception (e.g. socket.gaierror)
+                cause = e
+                while cause.__context__:
+                    cause = cause.__context__
+
+                if isinstance(cause, socket.gaierror):
+                    err_msg = "Couldn't resolve DNS"
+                elif isinstance(cause, ssl.SSLError):
+                    err_msg = "Unexpected SSL error"
+                elif isinstance(e, httpx.TooManyRedirects):
+                    err_msg = f"Too many redirects: {url}"
+                elif isinstance(e, httpx.ProxyError) or (
+                    proxy and isinstance(e, httpx.ConnectError)
+                ):
+                    err_msg = f"Error with the proxy: {proxy}"
+                    # Prevent from re-using it in the future
+                    if proxy in options["proxies"] and len(options["proxies"]) > 1:
+                        options["proxies"].remove(proxy)
+                elif isinstance(e, (httpx.InvalidURL, httpx.UnsupportedProtocol)):
+                    err_msg = f"Invalid URL: {url}"
+                elif isinstance(e, httpx.ConnectError):
+                    err_msg = f"Cannot connect to: {urlparse(url).netloc}"
+                elif isinstance(e, httpx.TimeoutException):
+                    err_msg = f"Request timeout: {url}"
+                elif isinstance(e, (httpx.ReadError, httpx.RemoteProtocolError, httpx.DecodingError)):
+                    err_msg = f"Failed to read response body: {url}"
+                else:
+                    err_msg = (
+                        f"There was a problem in the request to: {url}"
+                    )
+
+        raise RequestException(err_msg)
+
+    async def close(self):
+        for session in self.sessions.values():
+            await session.aclose()
+
+    def increase_rate(self):
+        self._rate += 1
+        asyncio.get_running_loop().call_later(1, self.decrease_rate)
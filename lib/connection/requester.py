@@ -62,19 +62,13 @@ class HTTPBearerAuth(AuthBase):
         return request
 
 
-class Requester:
+class BaseRequester:
     def __init__(self):
         self._url = None
         self._proxy_cred = None
         self._rate = 0
         self.headers = CaseInsensitiveDict(options["headers"])
         self.agents = []
-        self.session = requests.Session()
-        self.session.verify = False
-        self.session.cert = (
-            options["cert_file"],
-            options["key_file"],
-        )
 
         if options["random_agents"]:
             self._fetch_agents()
@@ -83,6 +77,52 @@ class Requester:
         if options["data"] and "content-type" not in self.headers:
             self.set_header("content-type", guess_mimetype(options["data"]))
 
+    def _fetch_agents(self):
+        self.agents = FileUtils.get_lines(
+            FileUtils.build_path(SCRIPT_PATH, "db", "user-agents.txt")
+        )
+
+    def set_url(self, url):
+        self._url = url
+
+    def set_header(self, key, value):
+        self.headers[key] = value.lstrip()
+
+    def set_proxy_auth(self, credential):
+        self._proxy_cred = credential
+
+    def parse_proxy(self, proxy):
+        if not proxy.startswith(PROXY_SCHEMES):
+            proxy = f"http://{proxy}"
+
+        if self._proxy_cred and "@" not in proxy:
+            # socks5://localhost:9050 => socks5://[credential]@localhost:9050
+            proxy = proxy.replace("://", f"://{self._proxy_cred}@", 1)
+
+        return proxy
+
+    def is_rate_exceeded(self):
+        return self._rate >= options["max_rate"] > 0
+
+    def decrease_rate(self):
+        self._rate -= 1
+
+    @property
+    @cached(RATE_UPDATE_DELAY)
+    def rate(self):
+        return self._rate
+
+
+class Requester(BaseRequester):
+    def __init__(self):
+        super().__init__()
+        self.session = requests.Session()
+        self.session.verify = False
+        self.session.cert = (
+            options["cert_file"],
+            options["key_file"],
+        )
+
         socket_options = []
         if options["network_interface"]:
             socket_options.append(
@@ -99,17 +139,6 @@ class Requester:
                 )
             )
 
-    def _fetch_agents(self):
-        self.agents = FileUtils.get_lines(
-            FileUtils.build_path(SCRIPT_PATH, "db", "user-agents.txt")
-        )
-
-    def set_url(self, url):
-        self._url = url
-
-    def set_header(self, key, value):
-        self.headers[key] = value.lstrip()
-
     def set_auth(self, type, credential):
         if type in ("bearer", "jwt"):
             self.session.auth = HTTPBearerAuth(credential)
@@ -131,20 +160,12 @@ class Requester:
         if not proxy:
             return
 
-        if not proxy.startswith(PROXY_SCHEMES):
-            proxy = f"http://{proxy}"
-
-        if self._proxy_cred and "@" not in proxy:
-            # socks5://localhost:9050 => socks5://[credential]@localhost:9050
-            proxy = proxy.replace("://", f"://{self._proxy_cred}@", 1)
+        proxy = self.parse_proxy(proxy)
 
         self.session.proxies = {"https": proxy}
         if not proxy.startswith("https://"):
             self.session.proxies["http"] = proxy
 
-    def set_proxy_auth(self, credential):
-        self._proxy_cred = credential
-
     # :path: is expected not to start with "/"
     def request(self, path, proxy=None):
         # Pause if the request rate exceeded the maximum
@@ -232,17 +253,6 @@ class Requester:
 
         raise RequestException(err_msg)
 
-    def is_rate_exceeded(self):
-        return self._rate >= options["max_rate"] > 0
-
-    def decrease_rate(self):
-        self._rate -= 1
-
     def increase_rate(self):
         self._rate += 1
         threading.Timer(1, self.decrease_rate).start()
-
-    @property
-    @cached(RATE_UPDATE_DELAY)
-    def rate(self):
-        return self._rate
@@ -20,33 +20,34 @@ from lib.core.settings import (
     DEFAULT_ENCODING, ITER_CHUNK_SIZE,
     MAX_RESPONSE_SIZE, UNKNOWN,
 )
+from lib.core.structures import CaseInsensitiveDict
 from lib.parse.url import clean_path, parse_path
 from lib.utils.common import is_binary
 
 
-class Response:
+class BaseResponse:
     def __init__(self, response):
-        self.url = response.url
-        self.full_path = parse_path(response.url)
+        self.url = str(response.url)
+        self.full_path = parse_path(self.url)
         self.path = clean_path(self.full_path)
-        self.status = response.status_code
-        self.headers = response.headers
+        self.status = None
+        self.headers = CaseInsensitiveDict(response.headers)
         self.redirect = self.headers.get("location") or ""
-        self.history = [res.url for res in response.history]
+        self.history = [str(res.url) for res in response.history]
         self.content = ""
         self.body = b""
 
-        for chunk in response.iter_content(chunk_size=ITER_CHUNK_SIZE):
-            self.body += chunk
+    def is_fully_read(self, size, binary):
+        return size >= MAX_RESPONSE_SIZE or (
+            "content-length" in self.headers and binary
+        )
 
-            if len(self.body) >= MAX_RESPONSE_SIZE or (
-                "content-length" in self.headers and is_binary(self.body)
-            ):
-                break
+    def set_body(self, body, binary, encoding):
+        self.body = bytes(body)
 
-        if not is_binary(self.body):
+        if not binary:
             self.content = self.body.decode(
-                response.encoding or DEFAULT_ENCODING, errors="ignore"
+                encoding or DEFAULT_ENCODING, errors="ignore"
             )
 
     @property
@@ -72,3 +73,45 @@ class Response:
             other.body,
             other.redirect,
         )
+
+
+class Response(BaseResponse):
+    def __init__(self, response):
+        super().__init__(response)
+        self.status = response.status_code
+        # bytearray is extended in place, concatenating bytes copies the whole body
+        body = bytearray()
+        binary = False
+
+        for chunk in response.iter_content(chunk_size=ITER_CHUNK_SIZE):
+            body += chunk
+            # The body is binary if any of its chunks is, no need to check it again
+            binary = binary or is_binary(chunk)
+
+            if self.is_fully_read(len(body), binary):
+                break
+
+        self.set_body(body, binary, response.encoding)
+
+
+class AsyncResponse(BaseResponse):
+    def __init__(self, response):
+        super().__init__(response)
+        self.status = response.status_code
+
+    @classmethod
+    async def create(cls, response):
+        self = cls(response)
+        body = bytearray()
+        binary = False
+
+        async for chunk in response.aiter_bytes(chunk_size=ITER_CHUNK_SIZE):
+            body += chunk
+            binary = binary or is_binary(chunk)
+
+            if self.is_fully_read(len(body), binary):
+                break
+
+        self.set_body(body, binary, response.charset_encoding)
+
+        return self
@@ -16,13 +16,17 @@
 #
 #  Author: Mauro Soria
 
+import asyncio
 import gc
 import os
 import psycopg
 import re
+import signal
 import time
 import mysql.connector
 
+from collections import deque
+from itertools import islice
 from urllib.parse import urlparse
 
 from lib.connection.dns import cache_dns
@@ -38,13 +42,14 @@ from lib.core.exceptions import (
     QuitInterrupt,
     UnpicklingError,
 )
-from lib.core.fuzzer import Fuzzer
+from lib.core.fuzzer import AsyncFuzzer, Fuzzer
 from lib.core.logger import enable_logging, logger
 from lib.core.settings import (
     BANNER,
     DEFAULT_HEADERS,
     DEFAULT_SESSION_FILE,
     EXTENSION_RECOGNITION_REGEX,
+    GC_THRESHOLDS,
     MAX_CONSECUTIVE_REQUEST_ERRORS,
     NEW_LINE,
     SCRIPT_PATH,
@@ -52,7 +57,7 @@ from lib.core.settings import (
     UNKNOWN,
 )
 from lib.parse.rawrequest import parse_raw
-from lib.parse.url import clean_path, parse_path
+from lib.parse.url import clean_path, parse_path, parse_redirect
 from lib.reports.csv_report import CSVReport
 from lib.reports.html_report import HTMLReport
 from lib.reports.json_report import JSONReport
@@ -72,6 +77,10 @@ from lib.view.terminal import interface
 
 class Controller:
     def __init__(self):
+        # Most objects created while scanning (responses, paths) don't have
+        # reference cycles, so cyclic collections are rarely worth it
+        gc.set_threshold(*GC_THRESHOLDS)
+
         if options["session_file"]:
             self._import(options["session_file"])
             self.old_session = True
@@ -79,6 +88,9 @@ class Controller:
             self.setup()
             self.old_session = False
 
+        # The dictionary, blacklists and requester live until the end, stop the
+        # garbage collector from re-scanning them in every collection
+        gc.freeze()
         self.run()
 
     def _import(self, session_file):
@@ -93,17 +105,22 @@ class Controller:
             exit(1)
 
         self.__dict__ = {**indict, **vars(self)}
+        # Older session files store the directories in a list
+        self.directories = deque(self.directories)
         print(last_output)
 
     def _export(self, session_file):
         # Save written output
         last_output = interface.buffer.rstrip()
 
-        # Can't pickle Fuzzer class due to _thread.lock objects
-        del self.fuzzer
+        dict_ = vars(self).copy()
+        # Can't pickle some classes due to _thread.lock objects
+        # or because they are bound to the event loop
+        for attr in ("fuzzer", "loop", "pause_future", "pause_task", "replay_tasks"):
+            dict_.pop(attr, None)
 
         with open(session_file, "wb") as fd:
-            pickle((vars(self), last_output, options), fd)
+            pickle((dict_, last_output, options), fd)
 
     def setup(self):
         blacklists.update(get_blacklists())
@@ -128,12 +145,21 @@ class Controller:
             if options["cookie"]:
                 options["headers"]["cookie"] = options["cookie"]
 
-        self.requester = Requester()
+        if options["async_mode"]:
+            # httpx (Python 3.8+) is only needed in asynchronous mode
+            from lib.connection.async_requester import AsyncRequester
+
+            self.requester = AsyncRequester()
+        else:
+            self.requester = Requester()
+
         self.dictionary = Dictionary(files=options["wordlists"])
         self.results = []
         self.start_time = time.time()
         self.passed_urls = set()
-        self.directories = []
+        # Directories are popped from the left once scanned, appends from
+        # the fuzzer threads are already serialized by @locked (recur())
+        self.directories = deque()
         self.report = None
         self.batch = False
         self.jobs_processed = 0
@@ -209,9 +235,27 @@ class Controller:
         )
         error_callbacks = (self.raise_error, self.append_error_log)
 
+        if options["async_mode"]:
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self.pause_task = None
+            # asyncio only keeps weak references to tasks
+            self.replay_tasks = set()
+
+            try:
+                self.loop.add_signal_handler(signal.SIGINT, self.handle_async_pause)
+            except NotImplementedError:
+                # Windows doesn't support loop.add_signal_handler()
+                signal.signal(
+                    signal.SIGINT,
+                    lambda *_: self.loop.call_soon_threadsafe(self.handle_async_pause),
+                )
+
+        fuzzer_class = AsyncFuzzer if options["async_mode"] else Fuzzer
+
         while options["urls"]:
             url = options["urls"][0]
-            self.fuzzer = Fuzzer(
+            self.fuzzer = fuzzer_class(
                 self.requester,
                 self.dictionary,
                 match_callbacks=match_callbacks,
@@ -250,6 +294,10 @@ class Controller:
             finally:
                 options["urls"].pop(0)
 
+        if options["async_mode"]:
+            self.loop.run_until_complete(self.requester.close())
+            self.loop.close()
+
         interface.warning("\nTask Completed")
 
         if options["session_file"]:
@@ -261,8 +309,6 @@ class Controller:
     def start(self):
         while self.directories:
             try:
-                gc.collect()
-
                 current_directory = self.directories[0]
 
                 if not self.old_session:
@@ -272,15 +318,21 @@ class Controller:
                     interface.warning(msg)
 
                 self.fuzzer.set_base_path(current_directory)
-                self.fuzzer.start()
-                self.process()
+
+                if options["async_mode"]:
+                    # Exceptions raised while pausing are passed through this future
+                    self.pause_future = self.loop.create_future()
+                    self.loop.run_until_complete(self.start_coroutines())
+                else:
+                    self.fuzzer.start()
+                    self.process()
 
             except KeyboardInterrupt:
                 pass
 
             finally:
                 self.dictionary.reset()
-                self.directories.pop(0)
+                self.directories.popleft()
 
                 self.jobs_processed += 1
                 self.old_session = False
@@ -450,7 +502,8 @@ class Controller:
             )
         ):
             if response.redirect:
-                new_path = clean_path(parse_path(response.redirect))
+                # Resolve relative redirects (e.g. "admin/") against the response URL
+                new_path = clean_path(parse_redirect(response.url, response.redirect))
                 added_to_queue = self.recur_for_redirect(response.path, new_path)
             elif len(response.history):
                 old_path = clean_path(parse_path(response.history[0]))
@@ -463,12 +516,24 @@ class Controller:
 
         if options["replay_proxy"]:
             # Replay the request with new proxy
-            self.requester.request(response.full_path, proxy=options["replay_proxy"])
+            if options["async_mode"]:
+                task = self.loop.create_task(self.replay_request(response.full_path))
+                self.replay_tasks.add(task)
+                task.add_done_callback(self.replay_tasks.discard)
+            else:
+                self.requester.request(response.full_path, proxy=options["replay_proxy"])
 
         if self.report:
             self.results.append(response)
             self.report.save(self.results)
 
+    async def replay_request(self, path):
+        try:
+            await self.requester.request(path, proxy=options["replay_proxy"])
+        except RequestException as e:
+            for callback in self.fuzzer.error_callbacks:
+                callback(e)
+
     def update_progress_bar(self, response):
         jobs_count = (
             # Jobs left for unscanned targets
@@ -506,7 +571,9 @@ class Controller:
             "CTRL+C detected: Pausing threads, please wait...", do_save=False
         )
         self.fuzzer.pause()
+        self.prompt_pause()
 
+    def prompt_pause(self):
         while True:
             msg = "[q]uit / [c]ontinue"
 
@@ -550,6 +617,26 @@ class Controller:
             elif option.lower() == "s" and len(options["urls"]) > 1:
                 raise SkipTargetInterrupt("Target skipped by the user")
 
+    def handle_async_pause(self):
+        # Signal handlers of the event loop can't wait for the running requests
+        # to finish, so the scan is paused from a task
+        if not self.pause_task or self.pause_task.done():
+            self.pause_task = self.loop.create_task(self.pause_coroutines())
+
+    async def pause_coroutines(self):
+        interface.warning(
+            "CTRL+C detected: Pausing threads, please wait...", do_save=False
+        )
+        await self.fuzzer.pause()
+
+        # Exceptions raised here wouldn't reach the scan, so they are set
+        # to the future that it's waiting for
+        try:
+            self.prompt_pause()
+        except (SkipTargetInterrupt, QuitInterrupt) as e:
+            if not self.pause_future.done():
+                self.pause_future.set_exception(e)
+
     def is_timed_out(self):
         return time.time() - self.start_time > options["max_time"] > 0
 
@@ -567,6 +654,48 @@ class Controller:
             except KeyboardInterrupt:
                 self.handle_pause()
 
+    async def start_coroutines(self):
+        task = self.loop.create_task(self.fuzzer.start())
+        timeout = None
+
+        if options["max_time"] > 0:
+            timeout = max(self.start_time + options["max_time"] - time.time(), 0)
+
+        try:
+            await asyncio.wait(
+                [task, self.pause_future],
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            if self.pause_future.done():
+                # Raise the exception from prompt_pause()
+                await self.pause_future
+            elif not task.done():
+                raise SkipTargetInterrupt(
+                    "Runtime exceeded the maximum set by the user"
+                )
+
+            await task
+            # Requests replayed to the proxy are sent in the background
+            await asyncio.gather(*self.replay_tasks)
+
+        finally:
+            # The fuzzer can still be running (skipped target or timeout), let its
+            # tasks finish instead of leaving them paused forever
+            self.fuzzer.quit()
+            tasks = [task, *self.replay_tasks]
+
+            # A pause can be waiting for tasks that won't reach the checkpoint anymore
+            if self.pause_task:
+                tasks.append(self.pause_task)
+
+            for task_ in tasks:
+                task_.cancel()
+
+            # Exceptions (if any) were already raised above
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     def add_directory(self, path):
         """Add directory to the recursion queue"""
 
@@ -608,7 +737,7 @@ class Controller:
             self.add_directory(path)
 
         # Return newly added directories
-        return self.directories[dirs_count:]
+        return list(islice(self.directories, dirs_count, None))
 
     def recur_for_redirect(self, path, redirect_path):
         if redirect_path == path + "/":
@@ -37,6 +37,7 @@ options = {
     "lowercase": False,
     "capitalization": False,
     "thread_count": 25,
+    "async_mode": False,
     "recursive": False,
     "deep_recursive": False,
     "force_recursive": False,
@@ -18,6 +18,8 @@
 
 import re
 
+from functools import lru_cache
+
 from lib.core.data import options
 from lib.core.decorators import locked
 from lib.core.settings import (
@@ -47,14 +49,23 @@ def get_blacklists():
             # Skip if cannot read file
             continue
 
-        blacklists[status] = Dictionary(
-            files=[blacklist_file_name],
-            is_blacklist=True,
+        # Stored as a tuple so str.endswith() can check all paths at once
+        blacklists[status] = tuple(
+            lstrip_once(path, "/")
+            for path in Dictionary(
+                files=[blacklist_file_name],
+                is_blacklist=True,
+            )
         )
 
     return blacklists
 
 
+@lru_cache(maxsize=None)
+def get_extension_suffixes(extensions):
+    return tuple(f".{extension}" for extension in extensions)
+
+
 class Dictionary:
     def __init__(self, **kwargs):
         self._index = 0
@@ -122,11 +133,15 @@ class Dictionary:
                 if not self.is_valid(line):
                     continue
 
-                # Classic dirsearch wordlist processing (with %EXT% keyword)
-                if EXTENSION_TAG in line.lower():
+                # Classic dirsearch wordlist processing (with %EXT% keyword),
+                # most lines don't have "%", so they don't need to be lowercased
+                if "%" in line and EXTENSION_TAG in line.lower():
+                    # The tag is case-insensitive, normalize it once so the (much
+                    # cheaper) str.replace() can be used for every extension
+                    line = re_ext_tag.sub(EXTENSION_TAG, line)
+
                     for extension in options["extensions"]:
-                        newline = re_ext_tag.sub(extension, line)
-                        wordlist.add(newline)
+                        wordlist.add(line.replace(EXTENSION_TAG, extension))
                 else:
                     wordlist.add(line)
 
@@ -183,14 +198,16 @@ class Dictionary:
             if altered_wordlist:
                 wordlist = altered_wordlist
 
+        # The wordlist is generated once and shared by every target and
+        # sub-directory, a tuple is the cheapest sequence to iterate/index
         if options["lowercase"]:
-            return list(map(str.lower, wordlist))
+            return tuple(map(str.lower, wordlist))
         elif options["uppercase"]:
-            return list(map(str.upper, wordlist))
+            return tuple(map(str.upper, wordlist))
         elif options["capitalization"]:
-            return list(map(str.capitalize, wordlist))
+            return tuple(map(str.capitalize, wordlist))
         else:
-            return list(wordlist)
+            return tuple(wordlist)
 
     def is_valid(self, path):
         # Skip comments and empty lines
@@ -200,7 +217,7 @@ class Dictionary:
         # Skip if the path has excluded extensions
         cleaned_path = clean_path(path)
         if cleaned_path.endswith(
-            tuple(f".{extension}" for extension in options["exclude_extensions"])
+            get_extension_suffixes(options["exclude_extensions"])
         ):
             return False
 
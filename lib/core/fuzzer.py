@@ -16,6 +16,7 @@
 #
 #  Author: Mauro Soria
 
+import asyncio
 import re
 import threading
 import time
@@ -23,80 +24,110 @@ import time
 from lib.core.data import blacklists, options
 from lib.core.exceptions import RequestException
 from lib.core.logger import logger
-from lib.core.scanner import Scanner
+from lib.core.scanner import AsyncScanner, Scanner
 from lib.core.settings import (
     DEFAULT_TEST_PREFIXES,
     DEFAULT_TEST_SUFFIXES,
+    RE2_INCOMPATIBLE_REGEX,
+    SCANNER_CATEGORIES,
     WILDCARD_TEST_POINT_MARKER,
 )
 from lib.parse.url import clean_path
-from lib.utils.common import human_size, lstrip_once
+from lib.utils.common import get_size_range
 from lib.utils.crawl import Crawler
 
+try:
+    import re2
 
-class Fuzzer:
+    # Other packages (e.g. pyre2) are imported as `re2` too but have another API
+    re2.Options
+except (ImportError, AttributeError):
+    re2 = None
+
+
+class BaseFuzzer:
     def __init__(self, requester, dictionary, **kwargs):
-        self._threads = []
         self._scanned = set()
         self._requester = requester
         self._dictionary = dictionary
-        self._play_event = threading.Event()
-        self._quit_event = threading.Event()
-        self._pause_semaphore = threading.Semaphore(0)
         self._base_path = None
-        self.exc = None
         self.match_callbacks = kwargs.get("match_callbacks", [])
         self.not_found_callbacks = kwargs.get("not_found_callbacks", [])
         self.error_callbacks = kwargs.get("error_callbacks", [])
+        # Compile the filters once instead of for every response
+        self._exclude_regex = None
+        self._exclude_redirect_regex = None
+        self._exclude_size_ranges = tuple(
+            get_size_range(size) for size in options["exclude_sizes"]
+        )
 
-    def setup_scanners(self):
-        self.scanners = {
-            "default": {},
-            "prefixes": {},
-            "suffixes": {},
-        }
+        if options["exclude_regex"]:
+            self._exclude_regex = self.compile_regex(options["exclude_regex"])
+
+        if options["exclude_redirect"]:
+            try:
+                self._exclude_redirect_regex = self.compile_regex(options["exclude_redirect"])
+            except re.error:
+                # Not a regex, it will only be matched as text
+                pass
+
+    @staticmethod
+    def compile_regex(pattern):
+        """
+        Compile a user-supplied regex with RE2 if it's installed (linear time
+        matching, no catastrophic backtracking), patterns that RE2 doesn't
+        support are compiled with `re`
+        """
+
+        if re2 and not re.search(RE2_INCOMPATIBLE_REGEX, pattern):
+            re2_options = re2.Options()
+            re2_options.log_errors = False
+
+            try:
+                return re2.compile(pattern, re2_options)
+            except re2.error:
+                pass
+
+        return re.compile(pattern)
+
+    def get_scanner_specs(self):
+        """
+        Category, name and keyword arguments of every scanner to set up
+        for the current directory
+        """
 
         # Default scanners (wildcard testers)
-        self.scanners["default"].update({
-            "index": Scanner(self._requester, path=self._base_path),
-            "random": Scanner(self._requester, path=self._base_path + WILDCARD_TEST_POINT_MARKER),
-        })
+        yield "default", "index", {"path": self._base_path}
+        yield "default", "random", {"path": self._base_path + WILDCARD_TEST_POINT_MARKER}
 
         if options["exclude_response"]:
-            self.scanners["default"]["custom"] = Scanner(
-                self._requester, tested=self.scanners, path=options["exclude_response"]
-            )
+            yield "default", "custom", {
+                "tested": self.scanners, "path": options["exclude_response"],
+            }
 
         for prefix in options["prefixes"] + DEFAULT_TEST_PREFIXES:
-            self.scanners["prefixes"][prefix] = Scanner(
-                self._requester, tested=self.scanners,
-                path=f"{self._base_path}{prefix}{WILDCARD_TEST_POINT_MARKER}",
-                context=f"/{self._base_path}{prefix}***",
-            )
+            yield "prefixes", prefix, {
+                "tested": self.scanners,
+                "path": f"{self._base_path}{prefix}{WILDCARD_TEST_POINT_MARKER}",
+                "context": f"/{self._base_path}{prefix}***",
+            }
 
-        for suffix in options["suffixes"] + DEFAULT_TEST_SUFFIXES:
-            self.scanners["suffixes"][suffix] = Scanner(
-                self._requester, tested=self.scanners,
-                path=f"{self._base_path}{WILDCARD_TEST_POINT_MARKER}{suffix}",
-                context=f"/{self._base_path}***{suffix}",
-            )
-
-        for extension in options["extensions"]:
-            if "." + extension not in self.scanners["suffixes"]:
-                self.scanners["suffixes"]["." + extension] = Scanner(
-                    self._requester, tested=self.scanners,
-                    path=f"{self._base_path}{WILDCARD_TEST_POINT_MARKER}.{extension}",
-                    context=f"/{self._base_path}***.{extension}",
-                )
+        suffixes = options["suffixes"] + DEFAULT_TEST_SUFFIXES
 
-    def setup_threads(self):
-        if self._threads:
-            self._threads = []
+        for suffix in suffixes:
+            yield "suffixes", suffix, {
+                "tested": self.scanners,
+                "path": f"{self._base_path}{WILDCARD_TEST_POINT_MARKER}{suffix}",
+                "context": f"/{self._base_path}***{suffix}",
+            }
 
-        for _ in range(options["thread_count"]):
-            new_thread = threading.Thread(target=self.thread_proc)
-            new_thread.daemon = True
-            self._threads.append(new_thread)
+        for extension in options["extensions"]:
+            if "." + extension not in suffixes:
+                yield "suffixes", "." + extension, {
+                    "tested": self.scanners,
+                    "path": f"{self._base_path}{WILDCARD_TEST_POINT_MARKER}.{extension}",
+                    "context": f"/{self._base_path}***.{extension}",
+                }
 
     def get_scanners_for(self, path):
         # Clean the path, so can check for extensions/suffixes
@@ -113,6 +144,111 @@ class Fuzzer:
         for scanner in self.scanners["default"].values():
             yield scanner
 
+    def is_excluded(self, resp):
+        """Validate the response by different filters"""
+
+        # Filters are ordered from the cheapest to the most expensive one
+        if resp.status in options["exclude_status_codes"]:
+            return True
+
+        if (
+            options["include_status_codes"]
+            and resp.status not in options["include_status_codes"]
+        ):
+            return True
+
+        length = resp.length
+
+        if length < options["minimum_response_size"]:
+            return True
+
+        if length > options["maximum_response_size"] > 0:
+            return True
+
+        if resp.path.endswith(blacklists.get(resp.status, ())):
+            return True
+
+        if any(length in size_range for size_range in self._exclude_size_ranges):
+            return True
+
+        if any(text in resp.content for text in options["exclude_texts"]):
+            return True
+
+        if self._exclude_regex and self._exclude_regex.search(resp.content):
+            return True
+
+        if (
+            options["exclude_redirect"]
+            and (
+                options["exclude_redirect"] in resp.redirect
+                or (
+                    self._exclude_redirect_regex
+                    and self._exclude_redirect_regex.search(resp.redirect)
+                )
+            )
+        ):
+            return True
+
+        return False
+
+    def process_response(self, path, response, scanners):
+        """Run the callbacks for the response, return whether it's a match"""
+
+        if self.is_excluded(response):
+            for callback in self.not_found_callbacks:
+                callback(response)
+            return False
+
+        for tester in scanners:
+            # Check if the response is unique, not wildcard
+            if not tester.check(path, response):
+                for callback in self.not_found_callbacks:
+                    callback(response)
+                return False
+
+        for callback in self.match_callbacks:
+            callback(response)
+
+        return True
+
+    def crawl(self, path, response):
+        """Yield the new paths found in the response"""
+
+        logger.info(f'crawling "/{path}"')
+
+        for path_ in Crawler.crawl(response):
+            if self._dictionary.is_valid(path_):
+                logger.info(f'found new path "/{path_}" in /{path}')
+                yield path_
+
+    def set_base_path(self, path):
+        self._base_path = path
+
+
+class Fuzzer(BaseFuzzer):
+    def __init__(self, requester, dictionary, **kwargs):
+        super().__init__(requester, dictionary, **kwargs)
+        self._threads = []
+        self._play_event = threading.Event()
+        self._quit_event = threading.Event()
+        self._pause_semaphore = threading.Semaphore(0)
+        self.exc = None
+
+    def setup_scanners(self):
+        self.scanners = {category: {} for category in SCANNER_CATEGORIES}
+
+        for category, name, kwargs in self.get_scanner_specs():
+            self.scanners[category][name] = Scanner(self._requester, **kwargs)
+
+    def setup_threads(self):
+        if self._threads:
+            self._threads = []
+
+        for _ in range(options["thread_count"]):
+            new_thread = threading.Thread(target=self.thread_proc)
+            new_thread.daemon = True
+            self._threads.append(new_thread)
+
     def start(self):
         self.setup_scanners()
         self.setup_threads()
@@ -154,89 +290,121 @@ class Fuzzer:
 
         response = self._requester.request(path)
 
-        if self.is_excluded(response):
-            for callback in self.not_found_callbacks:
-                callback(response)
-            return
-
-        for tester in scanners:
-            # Check if the response is unique, not wildcard
-            if not tester.check(path, response):
-                for callback in self.not_found_callbacks:
-                    callback(response)
-                return
-
         try:
-            for callback in self.match_callbacks:
-                callback(response)
+            is_match = self.process_response(path, response, scanners)
         except Exception as e:
             self.exc = e
+            return
 
-        if options["crawl"]:
-            logger.info(f'THREAD-{threading.get_ident()}: crawling "/{path}"')
-            for path_ in Crawler.crawl(response):
-                if self._dictionary.is_valid(path_):
-                    logger.info(f'THREAD-{threading.get_ident()}: found new path "/{path_}" in /{path}')
-                    self.scan(path_, self.get_scanners_for(path_))
+        if is_match and options["crawl"]:
+            for path_ in self.crawl(path, response):
+                self.scan(path_, self.get_scanners_for(path_))
 
-    def is_excluded(self, resp):
-        """Validate the response by different filters"""
+    def thread_proc(self):
+        logger.info(f'THREAD-{threading.get_ident()} started"')
 
-        if resp.status in options["exclude_status_codes"]:
-            return True
+        while True:
+            try:
+                path = next(self._dictionary)
+                scanners = self.get_scanners_for(path)
+                self.scan(self._base_path + path, scanners)
 
-        if (
-            options["include_status_codes"]
-            and resp.status not in options["include_status_codes"]
-        ):
-            return True
+            except StopIteration:
+                break
 
-        if (
-            resp.status in blacklists
-            and any(
-                resp.path.endswith(lstrip_once(suffix, "/"))
-                for suffix in blacklists.get(resp.status)
-            )
-        ):
-            return True
+            except RequestException as e:
+                for callback in self.error_callbacks:
+                    callback(e)
 
-        if human_size(resp.length).rstrip() in options["exclude_sizes"]:
-            return True
+                continue
 
-        if resp.length < options["minimum_response_size"]:
-            return True
+            finally:
+                time.sleep(options["delay"])
 
-        if resp.length > options["maximum_response_size"] > 0:
-            return True
+                if not self._play_event.is_set():
+                    logger.info(f'THREAD-{threading.get_ident()} paused"')
+                    self._pause_semaphore.release()
+                    self._play_event.wait()
+                    logger.info(f'THREAD-{threading.get_ident()} continued"')
 
-        if any(text in resp.content for text in options["exclude_texts"]):
-            return True
+                if self._quit_event.is_set():
+                    break
 
-        if options["exclude_regex"] and re.search(options["exclude_regex"], resp.content):
-            return True
 
-        if (
-            options["exclude_redirect"]
-            and (
-                options["exclude_redirect"] in resp.redirect
-                or re.search(options["exclude_redirect"], resp.redirect)
-            )
-        ):
-            return True
+class AsyncFuzzer(BaseFuzzer):
+    def __init__(self, requester, dictionary, **kwargs):
+        super().__init__(requester, dictionary, **kwargs)
+        self._tasks = []
+        self._play_event = asyncio.Event()
+        self._quit_event = asyncio.Event()
+        self._pause_semaphore = asyncio.Semaphore(0)
 
-        return False
+    async def setup_scanners(self):
+        self.scanners = {category: {} for category in SCANNER_CATEGORIES}
 
-    def set_base_path(self, path):
-        self._base_path = path
+        for category, name, kwargs in self.get_scanner_specs():
+            self.scanners[category][name] = await AsyncScanner.create(self._requester, **kwargs)
 
-    def thread_proc(self):
-        logger.info(f'THREAD-{threading.get_ident()} started"')
+    async def start(self):
+        # The fuzzer is reused for every directory
+        self._quit_event.clear()
+        self.play()
+
+        await self.setup_scanners()
+        # Don't start fuzzing if the scan was paused while setting up the scanners
+        await self._play_event.wait()
 
+        self._tasks = [
+            asyncio.ensure_future(self.task_proc())
+            for _ in range(options["thread_count"])
+        ]
+
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            # If one of the tasks raised an exception or the scan was cancelled,
+            # stop the others and wait for them, so none is left pending
+            for task in self._tasks:
+                task.cancel()
+
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def play(self):
+        self._play_event.set()
+
+    async def pause(self):
+        self._play_event.clear()
+        # Wait for all tasks to stop, so the words being requested are done
+        # before the dictionary index is shown or saved
+        for task in self._tasks:
+            if not task.done():
+                await self._pause_semaphore.acquire()
+
+    def quit(self):
+        self._quit_event.set()
+        self.play()
+
+    async def scan(self, path, scanners):
+        # Avoid scanned paths from being re-scanned. The path is marked before
+        # the request is awaited, so coroutines never request the same URL
+        # concurrently and there are no in-flight duplicates to coalesce
+        if path in self._scanned:
+            return
+        else:
+            self._scanned.add(path)
+
+        response = await self._requester.request(path)
+
+        if self.process_response(path, response, scanners) and options["crawl"]:
+            for path_ in self.crawl(path, response):
+                await self.scan(path_, self.get_scanners_for(path_))
+
+    async def task_proc(self):
         while True:
             try:
                 path = next(self._dictionary)
                 scanners = self.get_scanners_for(path)
-                self.scan(self._base_path + path, scanners)
+                await self.scan(self._base_path + path, scanners)
 
             except StopIteration:
                 break
@@ -248,13 +416,13 @@ class Fuzzer:
                 continue
 
             finally:
-                time.sleep(options["delay"])
+                await asyncio.sleep(options["delay"])
 
                 if not self._play_event.is_set():
-                    logger.info(f'THREAD-{threading.get_ident()} paused"')
+                    logger.info("Task paused")
                     self._pause_semaphore.release()
-                    self._play_event.wait()
-                    logger.info(f'THREAD-{threading.get_ident()} continued"')
+                    await self._play_event.wait()
+                    logger.info("Task continued")
 
                 if self._quit_event.is_set():
                     break
@@ -17,9 +17,12 @@
 #  Author: Mauro Soria
 
 import logging
+import os
+import time
 from logging.handlers import RotatingFileHandler
 
 from lib.core.data import options
+from lib.core.settings import LOG_FLUSH_INTERVAL
 
 
 logger = logging.getLogger(__name__)
@@ -27,10 +30,62 @@ logger.setLevel(logging.DEBUG)
 logger.disabled = True
 
 
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler flushes the file after every record, which is a syscall
+    for every request (and error) with all threads waiting for the handler lock.
+    Only flush once in a while instead and let the file buffer batch the writes,
+    the buffer is drained when the file is closed (log rotation or exit)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_flush = time.time()
+        self._size = None
+
+    def shouldRollover(self, record):
+        """
+        RotatingFileHandler seeks to the end of the file for every record to get
+        its size, which flushes the buffer, so the size is tracked here instead
+        """
+
+        if self.maxBytes <= 0:
+            return False
+
+        if self.stream is None:
+            self.stream = self._open()
+
+        if self._size is None:
+            # Never roll over anything other than regular files (bpo-45401)
+            if os.path.exists(self.baseFilename) and not os.path.isfile(self.baseFilename):
+                self.maxBytes = 0
+                return False
+
+            # Nothing was written yet, so there is nothing to flush
+            self._size = self.stream.seek(0, 2)
+
+        # maxBytes is in bytes, not characters
+        size = len(f"{self.format(record)}\n".encode(self.encoding or "utf-8"))
+
+        # Never roll over an empty file (gh-116263)
+        if self._size and self._size + size >= self.maxBytes:
+            # The record is written to the new file
+            self._size = size
+            return True
+
+        self._size += size
+        return False
+
+    def flush(self):
+        if time.time() - self._last_flush >= LOG_FLUSH_INTERVAL:
+            super().flush()
+            self._last_flush = time.time()
+
+
 def enable_logging():
     logger.disabled = False
     formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
-    handler = RotatingFileHandler(options["log_file"], maxBytes=options["log_file_size"])
+    handler = BufferedRotatingFileHandler(options["log_file"], maxBytes=options["log_file_size"])
     handler.setLevel(logging.DEBUG)
     handler.setFormatter(formatter)
     logger.addHandler(handler)
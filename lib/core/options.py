@@ -16,6 +16,9 @@
 #
 #  Author: Mauro Soria
 
+import re
+import sys
+
 from lib.core.settings import (
     AUTHENTICATION_TYPES,
     COMMON_EXTENSIONS,
@@ -145,7 +148,9 @@ def parse_options():
             ]
         )
     ]
-    opt.exclude_sizes = {size.strip().upper() for size in opt.exclude_sizes.split(",")}
+    opt.exclude_sizes = {
+        size.strip().upper() for size in opt.exclude_sizes.split(",") if size.strip()
+    }
 
     if opt.remove_extensions:
         opt.extensions = ("",)
@@ -186,6 +191,30 @@ def parse_options():
         )
         exit(1)
 
+    if opt.async_mode:
+        if sys.version_info < (3, 8):
+            print("Asynchronous mode requires Python 3.8 or higher")
+            exit(1)
+
+        if opt.auth_type in ("digest", "ntlm"):
+            print(f"'{opt.auth_type}' authentication is not supported in asynchronous mode")
+            exit(1)
+
+        if any(proxy.startswith("socks") for proxy in opt.proxies + [opt.replay_proxy or ""]):
+            print("SOCKS proxies are not supported in asynchronous mode")
+            exit(1)
+
+        if opt.network_interface:
+            print("Network interface is not supported in asynchronous mode")
+            exit(1)
+
+    if opt.exclude_regex:
+        try:
+            re.compile(opt.exclude_regex)
+        except re.error as e:
+            print(f"Invalid regular expression for --exclude-regex: {e}")
+            exit(1)
+
     if set(opt.extensions).intersection(opt.exclude_extensions):
         print(
             "Exclude extension list can not contain any extension "
@@ -246,6 +275,7 @@ def parse_config(opt):
 
     # General
     opt.thread_count = opt.thread_count or config.safe_getint("general", "threads", 25)
+    opt.async_mode = opt.async_mode or config.safe_getboolean("general", "async")
     opt.include_status_codes = opt.include_status_codes or config.safe_get(
         "general", "include-status"
     )
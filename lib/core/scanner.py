@@ -16,6 +16,8 @@
 #
 #  Author: Mauro Soria
 
+import asyncio
+import hashlib
 import re
 import time
 
@@ -24,6 +26,7 @@ from urllib.parse import unquote
 from lib.core.data import options
 from lib.core.logger import logger
 from lib.core.settings import (
+    MAX_WILDCARD_BODY_HASHES,
     REFLECTED_PATH_MARKER,
     TEST_PATH_LENGTH,
     WILDCARD_TEST_POINT_MARKER,
@@ -33,7 +36,7 @@ from lib.utils.diff import generate_matching_regex, DynamicContentParser
 from lib.utils.random import rand_string
 
 
-class Scanner:
+class BaseScanner:
     def __init__(self, requester, **kwargs):
         self.path = kwargs.get("path", "")
         self.tested = kwargs.get("tested", [])
@@ -41,37 +44,24 @@ class Scanner:
         self.requester = requester
         self.response = None
         self.wildcard_redirect_regex = None
-        self.setup()
+        self.wildcard_redirect_pattern = None
+        # Hashes of bodies that are known to be wildcard responses
+        self.wildcard_body_hashes = set()
 
-    def setup(self):
-        """
-        Generate wildcard response information containers, this will be
-        used to compare with other path responses
-        """
-
-        first_path = self.path.replace(
+    def get_test_path(self, omit=None):
+        return self.path.replace(
             WILDCARD_TEST_POINT_MARKER,
-            rand_string(TEST_PATH_LENGTH),
+            rand_string(TEST_PATH_LENGTH, omit=omit),
         )
-        first_response = self.requester.request(first_path)
-        self.response = first_response         
-        time.sleep(options["delay"])
 
-        duplicate = self.get_duplicate(first_response)
-        # Another test was performed before and has the same response as this
-        if duplicate:
-            self.content_parser = duplicate.content_parser
-            self.wildcard_redirect_regex = duplicate.wildcard_redirect_regex
-            logger.debug(f'Skipped the second test for "{self.context}"')
-            return
-
-        second_path = self.path.replace(
-            WILDCARD_TEST_POINT_MARKER,
-            rand_string(TEST_PATH_LENGTH, omit=first_path),
-        )
-        second_response = self.requester.request(second_path)
-        time.sleep(options["delay"])
+    def setup_from_duplicate(self, duplicate):
+        self.content_parser = duplicate.content_parser
+        self.wildcard_redirect_regex = duplicate.wildcard_redirect_regex
+        self.wildcard_redirect_pattern = duplicate.wildcard_redirect_pattern
+        self.wildcard_body_hashes = duplicate.wildcard_body_hashes
+        logger.debug(f'Skipped the second test for "{self.context}"')
 
+    def setup_from_responses(self, first_path, first_response, second_path, second_response):
         if first_response.redirect and second_response.redirect:
             self.wildcard_redirect_regex = self.generate_redirect_regex(
                 clean_path(first_response.redirect),
@@ -79,11 +69,17 @@ class Scanner:
                 clean_path(second_response.redirect),
                 second_path,
             )
+            self.wildcard_redirect_pattern = self.compile_redirect_regex(
+                self.wildcard_redirect_regex
+            )
             logger.debug(f'Pattern (regex) to detect wildcard redirects for "{self.context}": {self.wildcard_redirect_regex}')
 
         self.content_parser = DynamicContentParser(
             first_response.content, second_response.content
         )
+        self.wildcard_body_hashes.update(
+            (self.hash_body(first_response.body), self.hash_body(second_response.body))
+        )
 
     def get_duplicate(self, response):
         for category in self.tested:
@@ -100,7 +96,23 @@ class Scanner:
         if not self.response.content and not response.content:
             return self.response.body == response.body
 
-        return self.content_parser.compare_to(response.content)
+        # Wildcard pages are often the same for every path, so skip the (slow)
+        # content comparison for bodies that were already proven to be wildcard
+        body_hash = self.hash_body(response.body)
+        if body_hash in self.wildcard_body_hashes:
+            return True
+
+        if not self.content_parser.compare_to(response.content):
+            return False
+
+        if len(self.wildcard_body_hashes) < MAX_WILDCARD_BODY_HASHES:
+            self.wildcard_body_hashes.add(body_hash)
+
+        return True
+
+    @staticmethod
+    def hash_body(body):
+        return hashlib.blake2b(body, digest_size=8).digest()
 
     def check(self, path, response):
         """
@@ -118,14 +130,23 @@ class Scanner:
             # with them, so messy that I give up on finding a way to test them
             path = unquote(clean_path(path))
             redirect = unquote(clean_path(response.redirect))
-            regex_to_compare = self.wildcard_redirect_regex.replace(
-                REFLECTED_PATH_MARKER, re.escape(path)
-            )
-            is_wildcard_redirect = re.match(regex_to_compare, redirect, re.IGNORECASE)
+            is_wildcard_redirect = self.wildcard_redirect_pattern.match(redirect)
+
+            if (
+                is_wildcard_redirect
+                and "path" in self.wildcard_redirect_pattern.groupindex
+                and is_wildcard_redirect.group("path").lower() != path.lower()
+            ):
+                # The path was captured somewhere else (e.g. next to a `.*`), fall back
+                # to matching with the path put into the regex
+                regex_to_compare = self.wildcard_redirect_regex.replace(
+                    REFLECTED_PATH_MARKER, re.escape(path)
+                )
+                is_wildcard_redirect = re.match(regex_to_compare, redirect, re.IGNORECASE)
 
             # If redirection doesn't match the rule, mark as found
             if not is_wildcard_redirect:
-                logger.debug(f'"{redirect}" doesn\'t match the regular expression "{regex_to_compare}", passing')
+                logger.debug(f'"{redirect}" doesn\'t match the regular expression "{self.wildcard_redirect_regex}" (path: "{path}"), passing')
                 return True
 
         if self.is_wildcard(response):
@@ -133,6 +154,19 @@ class Scanner:
 
         return True
 
+    @staticmethod
+    def compile_redirect_regex(regex):
+        """
+        Compile the wildcard redirect regex once, the reflected path is captured
+        by a group (the next occurrences must be the same, so they are back-references)
+        and compared with the requested path later
+        """
+
+        regex = regex.replace(REFLECTED_PATH_MARKER, "(?P<path>.*?)", 1)
+        regex = regex.replace(REFLECTED_PATH_MARKER, "(?P=path)")
+
+        return re.compile(regex, re.IGNORECASE)
+
     @staticmethod
     def generate_redirect_regex(first_loc, first_path, second_loc, second_path):
         """
@@ -154,3 +188,63 @@ class Scanner:
             second_loc = unquote(second_loc).replace(second_path, REFLECTED_PATH_MARKER)
 
         return generate_matching_regex(first_loc, second_loc)
+
+
+class Scanner(BaseScanner):
+    def __init__(self, requester, **kwargs):
+        super().__init__(requester, **kwargs)
+        self.setup()
+
+    def setup(self):
+        """
+        Generate wildcard response information containers, this will be
+        used to compare with other path responses
+        """
+
+        first_path = self.get_test_path()
+        first_response = self.requester.request(first_path)
+        self.response = first_response
+        time.sleep(options["delay"])
+
+        duplicate = self.get_duplicate(first_response)
+        # Another test was performed before and has the same response as this
+        if duplicate:
+            self.setup_from_duplicate(duplicate)
+            return
+
+        second_path = self.get_test_path(omit=first_path)
+        second_response = self.requester.request(second_path)
+        time.sleep(options["delay"])
+
+        self.setup_from_responses(first_path, first_response, second_path, second_response)
+
+
+class AsyncScanner(BaseScanner):
+    @classmethod
+    async def create(cls, requester, **kwargs):
+        self = cls(requester, **kwargs)
+        await self.setup()
+        return self
+
+    async def setup(self):
+        """
+        Generate wildcard response information containers, this will be
+        used to compare with other path responses
+        """
+
+        first_path = self.get_test_path()
+        first_response = await self.requester.request(first_path)
+        self.response = first_response
+        await asyncio.sleep(options["delay"])
+
+        duplicate = self.get_duplicate(first_response)
+        # Another test was performed before and has the same response as this
+        if duplicate:
+            self.setup_from_duplicate(duplicate)
+            return
+
+        second_path = self.get_test_path(omit=first_path)
+        second_response = await self.requester.request(second_path)
+        await asyncio.sleep(options["delay"])
+
+        self.setup_from_responses(first_path, first_response, second_path, second_response)
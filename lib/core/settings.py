@@ -68,6 +68,8 @@ DEFAULT_TEST_PREFIXES = (".",)
 
 DEFAULT_TEST_SUFFIXES = ("/",)
 
+SCANNER_CATEGORIES = ("default", "prefixes", "suffixes")
+
 DEFAULT_TOR_PROXIES = ("socks5://127.0.0.1:9050", "socks5://127.0.0.1:9150")
 
 DEFAULT_HEADERS = {
@@ -92,6 +94,10 @@ QUERY_STRING_REGEX = r"^(\&?([^=& ]+)\=([^=& ]+)?){1,200}$"
 
 READ_RESPONSE_ERROR_REGEX = r"(ChunkedEncodingError|StreamConsumedError|UnrewindableBodyError)"
 
+# Syntax that RE2 supports but matches differently than `re`: `$` doesn't match
+# before a trailing newline and the character classes are ASCII-only
+RE2_INCOMPATIBLE_REGEX = r"\$|\\[bBdDsSwW]"
+
 URI_REGEX = r"^[a-z]{2,}:"
 
 ROBOTS_TXT_REGEX = r"(?:Allow|Disallow): /(.*)"
@@ -110,8 +116,14 @@ SOCKET_TIMEOUT = 6
 
 RATE_UPDATE_DELAY = 0.15
 
+LOG_FLUSH_INTERVAL = 1
+
+GC_THRESHOLDS = (50000, 10, 10)
+
 MAX_MATCH_RATIO = 0.98
 
+MAX_WILDCARD_BODY_HASHES = 100000
+
 ITER_CHUNK_SIZE = 1024 * 1024
 
 MAX_RESPONSE_SIZE = 80 * 1024 * 1024
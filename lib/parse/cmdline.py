@@ -168,6 +168,12 @@ def parse_arguments():
         metavar="THREADS",
         help="Number of threads",
     )
+    general.add_option(
+        "--async",
+        action="store_true",
+        dest="async_mode",
+        help="Enable asynchronous mode",
+    )
     general.add_option(
         "-r",
         "--recursive",
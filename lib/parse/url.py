@@ -16,6 +16,8 @@
 #
 #  Author: Mauro Soria
 
+from urllib.parse import urljoin
+
 from lib.utils.common import lstrip_once
 
 
@@ -40,3 +42,13 @@ def parse_path(value):
         return "/".join(url.split("/")[1:])
     except Exception:
         return lstrip_once(value, "/")
+
+
+def parse_redirect(url, location):
+    """Get the path that a (maybe relative) location redirects to from the URL"""
+
+    try:
+        return parse_path(urljoin(url, location))
+    except ValueError:
+        # Invalid location (e.g. "http://[bad/admin/"), it can't be resolved
+        return parse_path(location)
@@ -17,9 +17,9 @@
 #  Author: Mauro Soria
 
 import os
+import re
 import sys
 
-from functools import reduce
 from ipaddress import IPv4Network, IPv6Network
 from urllib.parse import quote, urljoin
 
@@ -43,17 +43,12 @@ def safequote(string_):
     return quote(string_, safe=URL_SAFE_CHARS)
 
 
-def _strip_and_uniquify_callback(array, item):
-    item = item.strip()
-    if not item or item in array:
-        return array
-
-    return array + [item]
-
-
 # Strip values and remove duplicates from a list, respect the order
 def strip_and_uniquify(array, type_=list):
-    return type_(reduce(_strip_and_uniquify_callback, array, []))
+    # Dictionary keys are unique and keep the insertion order, checking
+    # for duplicates in a list would be quadratic with big URL lists
+    stripped = (item.strip() for item in array)
+    return type_(dict.fromkeys(item for item in stripped if item))
 
 
 def lstrip_once(string, pattern):
@@ -88,6 +83,46 @@ def human_size(num):
     return f"{num}TB"
 
 
+def parse_human_size(size):
+    match = re.fullmatch(r"(\d+)([KMGT]?B)", size.strip().upper())
+
+    if not match:
+        return None
+
+    # Comparable key: (unit index, value)
+    return ["B", "KB", "MB", "GB", "TB"].index(match[2]), int(match[1])
+
+
+def get_size_range(size):
+    """
+    Get the range of lengths that human_size() formats as `size` (e.g. "1KB"
+    is range(1024, 1536)), to check lengths without formatting each of them
+    """
+
+    target = parse_human_size(size)
+    if not target:
+        return range(0)
+
+    # human_size() is monotonic, so the bounds can be binary searched
+    def search(is_after):
+        low, high = 0, 2 ** 64
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if is_after(parse_human_size(human_size(middle))):
+                high = middle
+            else:
+                low = middle + 1
+
+        return low
+
+    return range(
+        search(lambda key: key >= target),
+        search(lambda key: key > target),
+    )
+
+
 def is_binary(bytes):
     return bool(bytes.translate(None, TEXT_CHARS))
 
@@ -19,6 +19,9 @@
 import difflib
 import re
 
+from collections import Counter
+from os.path import commonprefix
+
 from lib.core.settings import MAX_MATCH_RATIO
 
 
@@ -28,11 +31,14 @@ class DynamicContentParser:
         self._differ = difflib.Differ()
         self._is_static = content1 == content2
         self._base_content = content1
+        self._base_words = content1.split()
 
         if not self._is_static:
             self._static_patterns = self.get_static_patterns(
-                self._differ.compare(content1.split(), content2.split())
+                self._differ.compare(self._base_words, content2.split())
             )
+            # Words that a content must have for its static patterns to match
+            self._static_words = Counter(pattern[2:] for pattern in self._static_patterns)
 
     def compare_to(self, content):
         """
@@ -45,13 +51,27 @@ class DynamicContentParser:
             if the similarity ratio of 2 responses is not high enough to prove they are the same
         """
 
-        if self._is_static and content == self._base_content:
-            return True
-
-        diff = self._differ.compare(self._base_content.split(), content.split())
-        static_patterns_are_matched = self._static_patterns == self.get_static_patterns(diff)
-        match_ratio = difflib.SequenceMatcher(None, self._base_content, content).ratio()
-        return static_patterns_are_matched or match_ratio > MAX_MATCH_RATIO
+        if self._is_static:
+            if content == self._base_content:
+                return True
+        else:
+            words = content.split()
+
+            # Counting words is linear, diffing is not, so only diff the contents
+            # if they have all the words of the static patterns
+            if not self._static_words - Counter(words):
+                diff = self._differ.compare(self._base_words, words)
+                if self._static_patterns == self.get_static_patterns(diff):
+                    return True
+
+        matcher = difflib.SequenceMatcher(None, self._base_content, content)
+        # real_quick_ratio() and quick_ratio() are cheap upper bounds of ratio(),
+        # no need to compute the (quadratic) ratio if they aren't high enough
+        return (
+            matcher.real_quick_ratio() > MAX_MATCH_RATIO
+            and matcher.quick_ratio() > MAX_MATCH_RATIO
+            and matcher.ratio() > MAX_MATCH_RATIO
+        )
 
     @staticmethod
     def get_static_patterns(patterns):
@@ -63,21 +83,13 @@ class DynamicContentParser:
 
 
 def generate_matching_regex(string1, string2):
-    start = "^"
-    end = "$"
-
-    for char1, char2 in zip(string1, string2):
-        if char1 != char2:
-            start += ".*"
-            break
-
-        start += re.escape(char1)
+    # commonprefix() compares character by character, it's not path-aware
+    start = commonprefix((string1, string2))
 
-    if start.endswith(".*"):
-        for char1, char2 in zip(string1[::-1], string2[::-1]):
-            if char1 != char2:
-                break
+    # Both strings are the same or one starts with the other
+    if len(start) == min(len(string1), len(string2)):
+        return f"^{re.escape(start)}$"
 
-            end = re.escape(char1) + end
+    end = commonprefix((string1[::-1], string2[::-1]))[::-1]
 
-    return start + end
+    return f"^{re.escape(start)}.*{re.escape(end)}$"
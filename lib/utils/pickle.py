@@ -25,13 +25,16 @@ from lib.core.exceptions import UnpicklingError
 
 ALLOWED_PICKLE_CLASSES = (
     "collections.OrderedDict",
+    "collections.deque",
     "http.cookiejar.Cookie",
     "http.cookiejar.DefaultCookiePolicy",
     "requests.adapters.HTTPAdapter",
     "requests.cookies.RequestsCookieJar",
     "requests.sessions.Session",
     "requests.structures.CaseInsensitiveDict",
+    "lib.connection.async_requester.AsyncRequester",
     "lib.connection.requester.Requester",
+    "lib.connection.response.AsyncResponse",
     "lib.connection.response.Response",
     "lib.connection.requester.Session",
     "lib.core.dictionary.Dictionary",
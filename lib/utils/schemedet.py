@@ -19,9 +19,15 @@
 import ssl
 import socket
 
+from functools import lru_cache
+
 from lib.core.settings import SOCKET_TIMEOUT
 
 
+# The result is cached because the same target is resolved more than once
+# (e.g. for the report file name and then for the scan), each probe costs
+# a TCP connection and a TLS handshake
+@lru_cache(maxsize=None)
 def detect_scheme(host, port):
     if not port:
         raise ValueError
@@ -18,9 +18,14 @@
 #
 #  Author: Mauro Soria
 
+import sys
 import unittest
 
 from tests.connection.test_dns import TestDNS  # noqa: F401
+from tests.connection.test_requester import TestRequester  # noqa: F401
+from tests.core.test_dictionary import TestDictionary  # noqa: F401
+from tests.core.test_fuzzer import TestFuzzer  # noqa: F401
+from tests.core.test_logger import TestLogger  # noqa: F401
 from tests.parse.test_config import TestConfigParser  # noqa: F401
 from tests.parse.test_headers import TestHeadersParser  # noqa: F401
 from tests.parse.test_url import TestURLParsers  # noqa: F401
@@ -32,6 +37,11 @@ from tests.utils.test_mimetype import TestMimeTypeUtils  # noqa: F401
 from tests.utils.test_random import TestRandom  # noqa: F401
 from tests.utils.test_schemedet import TestSchemedet  # noqa: F401
 
+# IsolatedAsyncioTestCase (and the asynchronous mode) requires Python 3.8+
+if sys.version_info >= (3, 8):
+    from tests.connection.test_response import TestAsyncResponse  # noqa: F401
+    from tests.core.test_async_fuzzer import TestAsyncFuzzer  # noqa: F401
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+from unittest import TestCase, skipIf
+
+try:
+    from lib.connection.async_requester import HTTPXRawPathURL
+except ModuleNotFoundError:
+    # httpx is only installed on Python 3.8+
+    HTTPXRawPathURL = None
+
+
+@skipIf(HTTPXRawPathURL is None, "httpx is not installed")
+class TestRequester(TestCase):
+    def test_raw_path_url(self):
+        self.assertEqual(HTTPXRawPathURL("http://example.com").raw_path, b"/")
+        self.assertEqual(
+            HTTPXRawPathURL("http://example.com/a/../b?c=d").raw_path,
+            b"/a/../b?c=d",
+            "The path was normalized",
+        )
+        self.assertEqual(
+            HTTPXRawPathURL("http://example.com/web.xml;.js").raw_path,
+            b"/web.xml;.js",
+            "Params were cut off the path",
+        )
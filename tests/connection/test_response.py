@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from lib.connection.response import AsyncResponse
+
+
+class DummyHTTPXResponse:
+    def __init__(self, chunks, status=200, path="foo", headers=None):
+        self.url = f"https://example.com/{path}"
+        self.status_code = status
+        self.headers = headers or {}
+        self.history = []
+        self.charset_encoding = "utf-8"
+        self.chunks = chunks
+        self.read_chunks = 0
+
+    async def aiter_bytes(self, chunk_size=None):
+        for chunk in self.chunks:
+            self.read_chunks += 1
+            yield chunk
+
+
+class TestAsyncResponse(IsolatedAsyncioTestCase):
+    async def test_text_body(self):
+        response = await AsyncResponse.create(DummyHTTPXResponse([b"foo ", "bär".encode()]))
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.path, "foo")
+        self.assertEqual(response.body, "foo bär".encode())
+        self.assertEqual(response.content, "foo bär")
+        self.assertEqual(response.length, 8)
+
+    async def test_binary_body(self):
+        xresponse = DummyHTTPXResponse([b"foo", b"\x00\x01", b"bar"], headers={"content-length": "8"})
+        response = await AsyncResponse.create(xresponse)
+        self.assertEqual(response.body, b"foo\x00\x01", "The body should stop being read once it's known to be binary")
+        self.assertEqual(response.content, "", "Binary bodies shouldn't be decoded")
+        self.assertEqual(response.length, 8)
+        self.assertEqual(xresponse.read_chunks, 2)
+
+    @patch("lib.connection.response.MAX_RESPONSE_SIZE", 4)
+    async def test_max_response_size(self):
+        xresponse = DummyHTTPXResponse([b"foo", b"bar", b"baz"])
+        response = await AsyncResponse.create(xresponse)
+        self.assertEqual(response.body, b"foobar")
+        self.assertEqual(xresponse.read_chunks, 2)
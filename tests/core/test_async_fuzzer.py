@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+import asyncio
+import os
+import tempfile
+
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from lib.connection.response import AsyncResponse
+from lib.core.data import options
+from lib.core.dictionary import Dictionary
+from lib.core.exceptions import SkipTargetInterrupt
+from lib.core.fuzzer import AsyncFuzzer
+from tests.connection.test_response import DummyHTTPXResponse
+
+
+class DummyRequester:
+    def __init__(self, found=()):
+        self.found = found
+        self.requested = []
+        self.done = 0
+
+    async def request(self, path):
+        # Requests from the wildcard tests aren't counted
+        if path.startswith("word"):
+            self.requested.append(path)
+
+        # Let other coroutines run, like a real request would
+        await asyncio.sleep(0.01)
+
+        if path.startswith("word"):
+            self.done += 1
+
+        status = 200 if path in self.found else 404
+        return await AsyncResponse.create(DummyHTTPXResponse([f"{status} {path}".encode()], status, path))
+
+
+@patch.dict(options, {"thread_count": 4, "exclude_texts": ()})
+class TestAsyncFuzzer(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        wordlist = os.path.join(self.directory.name, "wordlist.txt")
+
+        with open(wordlist, "w") as fd:
+            fd.write("\n".join(f"word{i}" for i in range(40)))
+
+        self.dictionary = Dictionary(files=[wordlist])
+        self.matches = []
+        self.not_found = []
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_fuzzer(self, requester, match_callbacks=None):
+        fuzzer = AsyncFuzzer(
+            requester,
+            self.dictionary,
+            match_callbacks=match_callbacks or [lambda response: self.matches.append(response.path)],
+            not_found_callbacks=[lambda response: self.not_found.append(response.path)],
+        )
+        fuzzer.set_base_path("")
+        return fuzzer
+
+    async def test_scan(self):
+        fuzzer = self.get_fuzzer(DummyRequester(found=("word3", "word7")))
+        await fuzzer.start()
+
+        self.assertEqual(sorted(self.matches), ["word3", "word7"])
+        self.assertEqual(len(self.not_found), 38)
+
+    async def test_pause(self):
+        requester = DummyRequester()
+        fuzzer = self.get_fuzzer(requester)
+        task = asyncio.ensure_future(fuzzer.start())
+
+        await asyncio.sleep(0.15)
+        await fuzzer.pause()
+        self.assertEqual(self.dictionary.index, len(self.not_found), "Words were still being requested after pausing")
+
+        paused_at = len(requester.requested)
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(requester.requested), paused_at, "Requests were sent while paused")
+
+        fuzzer.play()
+        await task
+        self.assertEqual(len(self.not_found), 40)
+
+    async def test_pause_while_setting_up(self):
+        requester = DummyRequester()
+        fuzzer = self.get_fuzzer(requester)
+        task = asyncio.ensure_future(fuzzer.start())
+
+        # Scanners are still being set up
+        await asyncio.sleep(0.01)
+        await fuzzer.pause()
+        await asyncio.sleep(0.15)
+        self.assertEqual(requester.requested, [], "Fuzzing started while paused")
+
+        fuzzer.play()
+        await task
+        self.assertEqual(len(self.not_found), 40)
+
+    async def test_quit(self):
+        requester = DummyRequester()
+        fuzzer = self.get_fuzzer(requester)
+        task = asyncio.ensure_future(fuzzer.start())
+
+        await asyncio.sleep(0.15)
+        await fuzzer.pause()
+        fuzzer.quit()
+        await task
+
+        self.assertLess(len(requester.requested), 40)
+        self.assertEqual(requester.done, len(requester.requested))
+
+    async def test_skip(self):
+        def skip(response):
+            raise SkipTargetInterrupt("Skipped")
+
+        requester = DummyRequester(found=("word5",))
+        fuzzer = self.get_fuzzer(requester, match_callbacks=[skip])
+
+        with self.assertRaises(SkipTargetInterrupt):
+            await fuzzer.start()
+
+        self.assertTrue(all(task.done() for task in fuzzer._tasks), "Tasks were left running after skipping")
+        self.assertLess(len(requester.requested), 40)
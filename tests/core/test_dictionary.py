@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+import os
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from lib.core.data import options
+from lib.core.dictionary import Dictionary
+
+
+class TestDictionary(TestCase):
+    @patch.dict(options, {"extensions": ("php", "html")})
+    def test_extension_tag(self):
+        with tempfile.TemporaryDirectory() as directory:
+            wordlist = os.path.join(directory, "wordlist.txt")
+
+            with open(wordlist, "w") as fd:
+                fd.write("index.%EXT%\nfoo.%ext%.%EXT%\nbar\n")
+
+            self.assertEqual(
+                list(Dictionary(files=[wordlist])),
+                ["index.php", "index.html", "foo.php.php", "foo.html.html", "bar"],
+            )
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+from unittest import TestCase
+
+from lib.core.fuzzer import BaseFuzzer
+
+
+class TestFuzzer(TestCase):
+    def test_compile_regex(self):
+        self.assertTrue(BaseFuzzer.compile_regex("foo.*bar").search("foo-bar"))
+        # Must match the same way with or without RE2 installed
+        self.assertTrue(BaseFuzzer.compile_regex("foo$").search("foo\n"), "`$` doesn't match before a trailing newline")
+        self.assertTrue(BaseFuzzer.compile_regex(r"f\w+").fullmatch("fiancé"), r"`\w` doesn't match Unicode characters")
+        self.assertTrue(BaseFuzzer.compile_regex(r"\d").search("\u0663"), r"`\d` doesn't match Unicode digits")
+        self.assertTrue(BaseFuzzer.compile_regex(r"\s").search("\xa0"), r"`\s` doesn't match Unicode spaces")
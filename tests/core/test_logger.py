@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+import logging
+import os
+import tempfile
+import time
+
+from unittest import TestCase
+
+from lib.core.logger import BufferedRotatingFileHandler
+
+
+class TestLogger(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.directory.name, "dirsearch.log")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def emit(self, handler, message):
+        handler.handle(logging.makeLogRecord({"msg": message}))
+
+    def test_buffered_writes(self):
+        handler = BufferedRotatingFileHandler(self.log_file, maxBytes=50000000)
+        # Don't flush during the test
+        handler._last_flush = time.time() + 3600
+
+        for i in range(5):
+            self.emit(handler, f"record {i}")
+
+        self.assertEqual(os.path.getsize(self.log_file), 0, "Records were flushed before the interval")
+
+        handler.close()
+        with open(self.log_file) as fd:
+            self.assertEqual(fd.read().splitlines(), [f"record {i}" for i in range(5)])
+
+    def test_rollover(self):
+        with open(self.log_file, "w") as fd:
+            fd.write("old\n")
+
+        # Every record is 9 bytes ("record N\n")
+        handler = BufferedRotatingFileHandler(self.log_file, maxBytes=30, backupCount=1)
+
+        for i in range(5):
+            self.emit(handler, f"record {i}")
+
+        handler.close()
+        with open(f"{self.log_file}.1") as fd:
+            self.assertEqual(fd.read().splitlines(), ["old", "record 0", "record 1"])
+        with open(self.log_file) as fd:
+            self.assertEqual(fd.read().splitlines(), ["record 2", "record 3", "record 4"])
+
+    def test_rollover_size_in_bytes(self):
+        # Every record is 10 characters but 16 bytes in UTF-8
+        handler = BufferedRotatingFileHandler(self.log_file, maxBytes=40, backupCount=1, encoding="utf-8")
+
+        for i in range(3):
+            self.emit(handler, f"записьN {i}")
+
+        handler.close()
+        with open(f"{self.log_file}.1", encoding="utf-8") as fd:
+            self.assertEqual(fd.read().splitlines(), ["записьN 0", "записьN 1"])
+
+    def test_no_rollover_of_empty_file(self):
+        handler = BufferedRotatingFileHandler(self.log_file, maxBytes=5, backupCount=1)
+        self.emit(handler, "oversized record")
+        handler.close()
+
+        self.assertFalse(os.path.exists(f"{self.log_file}.1"), "An empty file was rotated")
+        with open(self.log_file) as fd:
+            self.assertEqual(fd.read(), "oversized record\n")
@@ -19,7 +19,7 @@
 from unittest import TestCase
 
 from lib.core.settings import DUMMY_URL
-from lib.parse.url import clean_path, parse_path
+from lib.parse.url import clean_path, parse_path, parse_redirect
 
 
 class TestURLParsers(TestCase):
@@ -41,3 +41,9 @@ class TestURLParsers(TestCase):
             "foo/bar",
             "Path parser gives unexpected result",
         )
+
+    def test_parse_redirect(self):
+        self.assertEqual(parse_redirect(f"{DUMMY_URL}foo/admin", "admin/"), "foo/admin/", "Relative redirect isn't resolved")
+        self.assertEqual(parse_redirect(f"{DUMMY_URL}foo/admin", "/admin/"), "admin/")
+        self.assertEqual(parse_redirect(f"{DUMMY_URL}foo/admin", f"{DUMMY_URL}bar/"), "bar/")
+        self.assertEqual(parse_redirect(f"{DUMMY_URL}admin", "http://[bad/admin/"), "admin/", "Invalid redirect isn't handled")
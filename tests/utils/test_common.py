@@ -18,12 +18,13 @@
 
 from unittest import TestCase
 
-from lib.utils.common import merge_path, strip_and_uniquify, get_valid_filename
+from lib.utils.common import merge_path, strip_and_uniquify, get_valid_filename, get_size_range, human_size
 
 
 class TestCommonUtils(TestCase):
     def test_strip_and_uniquify(self):
         self.assertEqual(strip_and_uniquify(["foo", "bar", " bar ", "foo"]), ["foo", "bar"], "The results are not stripped or contain duplicates or in wrong order")
+        self.assertEqual(strip_and_uniquify(["a", "", " ", "b", "a"], type_=tuple), ("a", "b"), "Empty values are not removed or the type is wrong")
 
     def test_get_valid_filename(self):
         self.assertEqual(get_valid_filename("http://example.com:80/foobar"), "http___example.com_80_foobar", "Invalid filename for Windows")
@@ -31,3 +32,12 @@ class TestCommonUtils(TestCase):
     def test_merge_path(self):
         self.assertEqual(merge_path("http://example.com/foo", "bar"), "http://example.com/bar")
         self.assertEqual(merge_path("http://example.com/folder/", "foo/../bar/./"), "http://example.com/folder/bar/")
+
+    def test_get_size_range(self):
+        self.assertEqual(get_size_range("0B"), range(0, 1))
+        self.assertEqual(get_size_range("1kb"), range(1024, 1536), "Invalid range of lengths for 1KB")
+        self.assertEqual(get_size_range("abc"), range(0), "Invalid sizes should match nothing")
+        for size in ("12B", "1023B", "6KB", "3MB", "1GB"):
+            for length in get_size_range(size)[:2]:
+                self.assertEqual(human_size(length).rstrip(), size)
+            self.assertNotEqual(human_size(get_size_range(size)[-1] + 1).rstrip(), size)
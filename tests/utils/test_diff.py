@@ -24,7 +24,11 @@ from lib.utils.diff import DynamicContentParser, generate_matching_regex
 class TestDiff(TestCase):
     def test_generate_matching_regex(self):
         self.assertEqual(generate_matching_regex("add.php", "abc.php"), "^a.*\\.php$", "Matching regex isn't correct")
+        self.assertEqual(generate_matching_regex("/foo?a=1", "/foo?a=1"), "^/foo\\?a=1$", "Matching regex isn't correct")
+        self.assertEqual(generate_matching_regex("/foo", "/foobar"), "^/foo$", "Matching regex isn't correct")
 
     def test_dynamic_content_parser(self):
         self.assertEqual(DynamicContentParser("a b c", "a b d")._static_patterns, ["  a", "  b"], "Static patterns are not right")
         self.assertTrue(DynamicContentParser("a b c", "a b d").compare_to("a b ef"))
+        self.assertTrue(DynamicContentParser("foo 1 bar", "foo 2 bar").compare_to("foo 3 bar baz"), "Similar content is not matched")
+        self.assertFalse(DynamicContentParser("a b c", "a b d").compare_to("x y z"), "Different content is matched")